@@ -1,14 +1,15 @@
-import ctypes
 import logging
 import os
+import queue
 import subprocess
 import sys
 import threading
 import time
-from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterator, Optional, Sequence
+from typing import Iterable, Iterator, Optional, Sequence
 
 try:
     from colorama import Fore, Style  # type: ignore
@@ -26,12 +27,25 @@ from .config import (
     SKIP_EXTENSIONS,
     get_cpu_info,
 )
-from .file_utils import get_size_category, is_file_compressed, should_compress_file, should_skip_directory
+from .file_utils import (
+    contains_protected_path,
+    get_size_category,
+    get_volume_details,
+    is_file_compressed,
+    is_protected_path,
+    is_redirected_directory,
+    lower_suffix,
+    should_compress_file,
+    should_skip_directory,
+)
 from .stats import CompressionStats, LegacyCompressionStats, Spinner
 from .timer import PerformanceMonitor
 
 _BATCH_SIZE = 100
+_PLAN_BATCH_SIZE = 256
 _MAX_COMMAND_CHARS = 4000
+_MAX_BATCH_BYTES = 256 * 1024 * 1024
+_ROTATIONAL_IO_WORKERS = 2
 
 _WORKER_CAP: Optional[int] = None
 
@@ -55,32 +69,30 @@ def _hidden_startupinfo() -> subprocess.STARTUPINFO:
     return startupinfo
 
 
-def _run_compact(command: str, *, capture: bool = False) -> subprocess.CompletedProcess:
+def _run_compact(arguments: list[str], *, capture: bool = False) -> subprocess.CompletedProcess:
     return subprocess.run(
-        command,
+        ['compact', *arguments],
         stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
         stderr=subprocess.PIPE if capture else subprocess.DEVNULL,
         startupinfo=_hidden_startupinfo(),
-        shell=True,
         text=capture,
     )
 
 
-def compress_file(file_path: Path, algorithm: str) -> bool:
+def compress_file(file_path: str, algorithm: str) -> bool:
     try:
-        command = fr'compact /c /a /exe:{algorithm} "{file_path.resolve()}"'
-        result = _run_compact(command)
+        result = _run_compact(['/c', '/a', f'/exe:{algorithm}', file_path])
         return result.returncode == 0
     except Exception as exc:
         logging.error("Error compressing %s: %s", file_path, exc)
         return False
 
 
-def legacy_compress_file(file_path: Path) -> bool:
+def legacy_compress_file(file_path: str) -> bool:
     try:
-        command = fr'compact /c "{Path(file_path).resolve()}"'
-        result = _run_compact(command, capture=True)
-        logging.debug("Command: %s", command)
+        arguments = ['/c', file_path]
+        result = _run_compact(arguments, capture=True)
+        logging.debug("Command: compact %s", subprocess.list2cmdline(arguments))
         logging.debug("Output: %s", result.stdout)
         return result.returncode == 0
     except Exception as exc:
@@ -88,18 +100,42 @@ def legacy_compress_file(file_path: Path) -> bool:
         return False
 
 
-def get_compressed_size(file_path: Path) -> int:
-    getter = ctypes.windll.kernel32.GetCompressedFileSizeW
-    getter.argtypes = [ctypes.c_wchar_p, ctypes.POINTER(ctypes.c_ulong)]
-    getter.restype = ctypes.c_ulong
+def _chunk(entries: Sequence[tuple[str, int]], size: int) -> list[list[tuple[str, int]]]:
+    # Entries come from walking an already-resolved base directory, so their paths are absolute as they stand
+    batches: list[list[tuple[str, int]]] = []
+    current: list[tuple[str, int]] = []
+    current_length = 0
+    current_bytes = 0
+
+    for path, file_size in entries:
+        path_length = len(path) + 3  # keep CreateProcess payload under limits
+        # Cap bytes per batch too, so a run of huge files doesn't pin a single worker while the rest sit idle
+        if current and (
+            len(current) >= size
+            or current_length + path_length > _MAX_COMMAND_CHARS
+            or current_bytes + file_size > _MAX_BATCH_BYTES
+        ):
+            batches.append(current)
+            current = []
+            current_length = 0
+            current_bytes = 0
+
+        current.append((path, file_size))
+        current_length += path_length
+        current_bytes += file_size
+
+    if current:
+        batches.append(current)
+
+    return batches
+
 
-    high = ctypes.c_ulong(0)
-    low = getter(str(file_path), ctypes.byref(high))
-    if low == 0xFFFFFFFF:
-        error = ctypes.get_last_error()
-        if error:
-            raise ctypes.WinError(error)
-    return (high.value << 32) + low
+def _compact_batch(algo: str, paths: Sequence[str]) -> subprocess.CompletedProcess:
+    return _run_compact(['/c', '/a', f'/exe:{algo}', *paths])
+
+
+def _legacy_compact_batch(paths: Sequence[str]) -> subprocess.CompletedProcess:
+    return _run_compact(['/c', *paths])
 
 
 def compress_directory(directory_path: str, verbose: bool = False, thorough_check: bool = False) -> tuple[CompressionStats, PerformanceMonitor]:
@@ -111,24 +147,25 @@ def compress_directory(directory_path: str, verbose: bool = False, thorough_chec
     if thorough_check:
         logging.info("Using thorough checking mode - this will be slower but more accurate for previously compressed files")
 
-    all_files = list(_iter_files(base_dir))
-    total_files = len(all_files)
-    monitor.stats.total_files = total_files
-
+    interactive = _is_interactive_output(verbose)
     spinner: Optional[Spinner] = None
-    if not verbose:
+    if interactive:
         spinner = Spinner()
         spinner.set_label("Scanning files...")
-        spinner.start(total=total_files)
+        spinner.start()
         spinner.update(0, "")
 
-    plan = _plan_compression(all_files, stats, monitor, thorough_check, spinner, verbose)
+    # Feed the walk straight into the planner; the file total is only known once the walk finishes
+    plan = _plan_compression(_iter_files(base_dir), str(base_dir), stats, monitor, thorough_check, spinner, verbose)
+    total_files = monitor.stats.total_files
     monitor.stats.files_skipped = stats.skipped_files
 
-    if spinner and not verbose:
-        final_skip_message = f"Skipped {stats.skipped_files}/{total_files} poorly compressible files"
+    final_skip_message = f"Skipped {stats.skipped_files}/{total_files} poorly compressible files"
+    if spinner:
         spinner.stop(final_message=final_skip_message)
         spinner = None
+    elif not verbose:
+        print(final_skip_message)
 
     if plan:
         _execute_plan(
@@ -144,67 +181,218 @@ def compress_directory(directory_path: str, verbose: bool = False, thorough_chec
     return stats, monitor
 
 
-def _iter_files(root: Path) -> Iterator[Path]:
-    for current_root, dirnames, files in os.walk(root):
-        current_base = Path(current_root)
+def _is_interactive_output(verbose: bool) -> bool:
+    # Spinners and ANSI redraws only make sense on a console; piped output gets plain lines instead
+    return not verbose and sys.stdout.isatty()
 
-        keep_dirs: list[str] = []
-        for directory in dirnames:
-            candidate = current_base / directory
+
+def _iter_files(root: Path) -> Iterator[os.DirEntry]:
+    # Each pending directory carries whether a protected directory can still appear beneath it; once that is
+    # ruled out, its whole subtree is walked without consulting the exclusion index again
+    pending = [(str(root), is_protected_path(root) or contains_protected_path(root))]
+    while pending:
+        directory, check_children = pending.pop()
+        children, files = _list_directory(directory)
+        for candidate in children:
+            if not check_children:
+                pending.append((candidate, False))
+                continue
             skip, reason = should_skip_directory(candidate)
             if skip:
                 logging.debug("Skipping directory %s: %s", candidate, reason)
                 continue
-            keep_dirs.append(directory)
-        dirnames[:] = keep_dirs
+            pending.append((candidate, contains_protected_path(candidate)))
+        yield from files
+
+
+# On Windows each DirEntry carries the size, attributes and reparse tag from the listing itself, so the entries
+# handed out here answer stat() without another syscall
+def _list_directory(directory: str) -> tuple[list[str], list[os.DirEntry]]:
+    children: list[str] = []
+    files: list[os.DirEntry] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if is_redirected_directory(entry):
+                            logging.debug("Skipping linked directory %s", entry.path)
+                            continue
+                        children.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue
+    except OSError as exc:
+        logging.debug("Unable to list directory %s: %s", directory, exc)
+    return children, files
+
+
+def _scandir_files(root: str) -> Iterator[os.DirEntry]:
+    pending = [root]
+    while pending:
+        children, files = _list_directory(pending.pop())
+        pending.extend(children)
+        yield from files
+
+
+def _on_rotational_volume(path: str) -> bool:
+    # Reuses the cached probe from the HDD prompt; a spinning disk seeks per concurrent request whatever the
+    # compaction throttle answer was
+    try:
+        return get_volume_details(path, deep_probe=True).rotational is True
+    except Exception as exc:
+        logging.debug("Unable to detect drive type for %s: %s", path, exc)
+        return False
+
 
-        for name in files:
-            yield current_base / name
+def _walk_worker_count(root: str) -> int:
+    if _on_rotational_volume(root):
+        return _apply_worker_cap(_ROTATIONAL_IO_WORKERS)
+    physical, _ = get_cpu_info()
+    # Listing directories waits on the filesystem rather than the CPU, so oversubscribe the cores
+    return _apply_worker_cap(min(32, (physical or 2) * 4))
+
+
+def _parallel_scandir_files(root: str, workers: int) -> Iterator[os.DirEntry]:
+    # Concurrent listings send a spinning disk's heads across the platter, so HDDs are always walked in one thread
+    if workers <= 1 or _on_rotational_volume(root):
+        yield from _scandir_files(root)
+        return
+
+    pending: list[str] = [root]
+    active = 0
+    condition = threading.Condition()
+    stop = threading.Event()
+    results: queue.Queue[Optional[list[os.DirEntry]]] = queue.Queue(maxsize=workers * 4)
+
+    def _worker() -> None:
+        nonlocal active
+        try:
+            while True:
+                with condition:
+                    while not pending and active and not stop.is_set():
+                        condition.wait()
+                    if stop.is_set() or not pending:
+                        # Nothing left to pop and nobody can push more: the walk is finished
+                        condition.notify_all()
+                        return
+                    current = pending.pop()
+                    active += 1
+
+                children: list[str] = []
+                files: list[os.DirEntry] = []
+                try:
+                    children, files = _list_directory(current)
+                finally:
+                    # Always release the slot, or the other workers would wait forever for this one to push
+                    with condition:
+                        pending.extend(children)
+                        active -= 1
+                        condition.notify_all()
+                if files:
+                    results.put(files)
+        finally:
+            results.put(None)
+
+    for _ in range(workers):
+        threading.Thread(target=_worker, daemon=True).start()
+
+    finished = 0
+    try:
+        while finished < workers:
+            batch = results.get()
+            if batch is None:
+                finished += 1
+                continue
+            yield from batch
+    finally:
+        # Drain so workers blocked on a full queue can see the stop flag when the caller bails early
+        stop.set()
+        with condition:
+            condition.notify_all()
+        while finished < workers:
+            if results.get() is None:
+                finished += 1
 
 
 def _plan_compression(
-    files: Sequence[Path],
+    files: Iterable[os.DirEntry],
+    root: str,
     stats: CompressionStats,
     monitor: PerformanceMonitor,
     thorough_check: bool,
     spinner: Optional[Spinner],
     verbose: bool,
-) -> list[tuple[Path, int, str]]:
-    candidates: list[tuple[Path, int, str]] = []
-    with monitor.time_file_scan():
-        for index, file_path in enumerate(files, start=1):
+) -> list[tuple[str, int, str]]:
+    candidates: list[tuple[str, int, str]] = []
+    # Eligibility checks wait on GetCompressedFileSizeW and compact.exe, so they share the walk's I/O-bound sizing
+    workers = _walk_worker_count(root)
+    scanned = 0
+
+    def _absorb(result: tuple[CompressionStats, list[tuple[str, int, str]]]) -> None:
+        tally, planned = result
+        stats.merge(tally)
+        candidates.extend(planned)
+
+    with monitor.time_file_scan(), ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: set[Future] = set()
+        batch: list[os.DirEntry] = []
+        for scanned, entry in enumerate(files, start=1):
             if spinner and not verbose:
-                spinner.update(index)
-            try:
-                should_compress, reason, current_size = should_compress_file(file_path, thorough_check)
-                file_size = file_path.stat().st_size
-                stats.total_original_size += file_size
-
-                if should_compress:
-                    algorithm = COMPRESSION_ALGORITHMS[get_size_category(file_size)]
-                    candidates.append((file_path, file_size, algorithm))
-                else:
-                    stats.skipped_files += 1
-                    resolved_size = current_size if current_size else file_size
-                    stats.total_compressed_size += resolved_size
-                    stats.total_skipped_size += file_size
-                    if "already compressed" in reason.lower():
-                        stats.already_compressed_files += 1
-                    logging.debug("Skipping %s: %s", file_path, reason)
-            except Exception as exc:
-                # Keep marching even when stat calls misbehave on a single file
-                stats.errors.append(f"Error processing {file_path}: {exc}")
-                stats.skipped_files += 1
-                try:
-                    file_size_fallback = file_path.stat().st_size
-                    stats.total_compressed_size += file_size_fallback
-                    stats.total_skipped_size += file_size_fallback
-                except Exception:
-                    pass
-                logging.error("Error processing %s: %s", file_path, exc)
+                spinner.update(scanned)
+            batch.append(entry)
+            if len(batch) < _PLAN_BATCH_SIZE:
+                continue
+            pending.add(executor.submit(_plan_batch, batch, thorough_check))
+            batch = []
+            # Bound the in-flight batches so a huge walk never queues the whole tree in memory
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _absorb(future.result())
+        if batch:
+            pending.add(executor.submit(_plan_batch, batch, thorough_check))
+        for future in as_completed(pending):
+            _absorb(future.result())
+    monitor.stats.total_files = scanned
     return candidates
 
 
+def _plan_batch(entries: list[os.DirEntry], thorough_check: bool) -> tuple[CompressionStats, list[tuple[str, int, str]]]:
+    tally = CompressionStats()
+    candidates: list[tuple[str, int, str]] = []
+    for entry in entries:
+        file_path = entry.path
+        stat_result: Optional[os.stat_result] = None
+        try:
+            stat_result = entry.stat()
+            file_size = stat_result.st_size
+            tally.total_original_size += file_size
+            should_compress, reason, current_size = should_compress_file(file_path, thorough_check, stat_result)
+
+            if should_compress:
+                algorithm = COMPRESSION_ALGORITHMS[get_size_category(file_size)]
+                candidates.append((file_path, file_size, algorithm))
+            else:
+                tally.skipped_files += 1
+                resolved_size = current_size if current_size else file_size
+                tally.total_compressed_size += resolved_size
+                tally.total_skipped_size += file_size
+                if "already compressed" in reason.lower():
+                    tally.already_compressed_files += 1
+                logging.debug("Skipping %s: %s", file_path, reason)
+        except Exception as exc:
+            # Keep marching even when stat calls misbehave on a single file
+            tally.errors.append(f"Error processing {file_path}: {exc}")
+            tally.skipped_files += 1
+            if stat_result is not None:
+                tally.total_compressed_size += stat_result.st_size
+                tally.total_skipped_size += stat_result.st_size
+            logging.error("Error processing %s: %s", file_path, exc)
+    return tally, candidates
+
+
 def _xp_worker_count() -> int:
     _, logical = get_cpu_info()
     threads = logical
@@ -226,7 +414,7 @@ def _lzx_worker_count() -> int:
     return _apply_worker_cap(2)
 
 def _execute_plan(
-    plan: Sequence[tuple[Path, int, str]],
+    plan: Sequence[tuple[str, int, str]],
     stats: CompressionStats,
     monitor: PerformanceMonitor,
     verbose: bool,
@@ -235,33 +423,11 @@ def _execute_plan(
     if not total:
         return
 
-    def _chunk(entries: Sequence[tuple[Path, int]], size: int) -> list[list[tuple[Path, int]]]:
-        batches: list[list[tuple[Path, int]]] = []
-        current: list[tuple[Path, int]] = []
-        current_length = 0
-
-        for path, file_size in entries:
-            path_length = len(str(path.resolve())) + 3  # keep CreateProcess payload under limits
-            if current and (len(current) >= size or current_length + path_length > _MAX_COMMAND_CHARS):
-                batches.append(current)
-                current = []
-                current_length = 0
-
-            current.append((path, file_size))
-            current_length += path_length
-
-        if current:
-            batches.append(current)
-
-        return batches
-
-    def _compact_batch(algo: str, paths: Sequence[Path]) -> subprocess.CompletedProcess:
-        quoted = " ".join(f'"{path.resolve()}"' for path in paths)
-        return _run_compact(f'compact /c /a /exe:{algo} {quoted}')
+    interactive = _is_interactive_output(verbose)
 
-    def _record_success(path: Path, compressed_size: int, algo: str, verified: bool) -> None:
-        stats.compressed_files += 1
-        stats.total_compressed_size += compressed_size
+    def _record_success(tally: CompressionStats, path: str, compressed_size: int, algo: str, verified: bool) -> None:
+        tally.compressed_files += 1
+        tally.total_compressed_size += compressed_size
         if verified:
             logging.debug("Compressed %s using %s", path, algo)
         else:
@@ -271,103 +437,96 @@ def _execute_plan(
                 algo,
             )
 
-    def _record_failure(path: Path, file_size: int, algo: str, reason: Optional[str] = None) -> None:
-        stats.skipped_files += 1
-        stats.total_compressed_size += file_size
-        stats.total_skipped_size += file_size
+    def _record_failure(
+        tally: CompressionStats,
+        path: str,
+        file_size: int,
+        algo: str,
+        reason: Optional[str] = None,
+    ) -> None:
+        tally.skipped_files += 1
+        tally.total_compressed_size += file_size
+        tally.total_skipped_size += file_size
         if reason:
             logging.debug("Compression skipped for %s using %s: %s", path, algo, reason)
         else:
             logging.debug("Compression failed for %s using %s", path, algo)
 
-    def _finalize_success(path: Path, fallback_size: int, algo: str, context: str) -> None:
+    def _finalize_success(tally: CompressionStats, path: str, fallback_size: int, algo: str, context: str) -> None:
         try:
             verified, compressed_size = is_file_compressed(path, thorough_check=False)
         except Exception as exc:  # pragma: no cover - defensive
-            stats.errors.append(f"Error verifying {path}: {exc}")
+            tally.errors.append(f"Error verifying {path}: {exc}")
             logging.error("Error verifying %s after %s compression: %s", path, context, exc)
-            _record_success(path, fallback_size, algo, verified=False)
+            _record_success(tally, path, fallback_size, algo, verified=False)
         else:
-            _record_success(path, compressed_size, algo, verified)
+            _record_success(tally, path, compressed_size, algo, verified)
 
-    def _compress_single(path: Path, file_size: int, algo: str) -> None:
-        with monitor.time_compression():
-            success = compress_file(path, algo)
-
-        if not success:
-            _record_failure(path, file_size, algo)
+    def _compress_single(tally: CompressionStats, path: str, file_size: int, algo: str) -> None:
+        if not compress_file(path, algo):
+            _record_failure(tally, path, file_size, algo)
             return
 
-        _finalize_success(path, file_size, algo, context='fallback')
+        _finalize_success(tally, path, file_size, algo, context='fallback')
 
-    def _process_group(algo: str, entries: Sequence[tuple[Path, int]], workers: int, stage_idx: int) -> None:
-        if not entries:
-            return
+    def _compress_batch(algo: str, batch: Sequence[tuple[str, int]]) -> CompressionStats:
+        # Runs on a worker thread; results land in a private tally that the caller merges once per batch
+        tally = CompressionStats()
+        try:
+            result = _compact_batch(algo, [path for path, _ in batch])
+        except Exception as exc:  # pragma: no cover - defensive
+            logging.error(
+                "Batch compression exception (%s files, algo=%s): %s. Retrying individually.",
+                len(batch),
+                algo,
+                exc,
+            )
+            for path, file_size in batch:
+                tally.errors.append(f"Batch exception for {path}: {exc}")
+                _compress_single(tally, path, file_size, algo)
+            return tally
+
+        if result.returncode != 0:
+            logging.debug(
+                "Batch compact returned %s for %s with %s files. Falling back to single-file attempts.",
+                result.returncode,
+                algo,
+                len(batch),
+            )
+            for path, file_size in batch:
+                _compress_single(tally, path, file_size, algo)
+            return tally
 
-        progress = stage_progress[stage_idx]
+        for path, file_size in batch:
+            _finalize_success(tally, path, file_size, algo, context='batch')
+        return tally
 
-        def _advance(count: int) -> None:
-            if count <= 0:
-                return
-            if verbose:
-                progress['processed'] = min(progress['processed'] + count, progress['total'])
-                return
-            with render_lock:
-                progress['processed'] = min(progress['processed'] + count, progress['total'])
+    def _process_group(algo: str, entries: Sequence[tuple[str, int]], workers: int, stage_idx: int) -> None:
+        if not entries:
+            return
 
         batches = _chunk(entries, _BATCH_SIZE)
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = {
-                executor.submit(
-                    _compact_batch,
-                    algo,
-                    [path for path, _ in batch],
-                ): batch
-                for batch in batches
-            }
+        # Batches and their single-file fallbacks run on the workers, so the stage's wall time is what gets measured
+        with monitor.time_compression(), ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_compress_batch, algo, batch): batch for batch in batches}
 
             for future in as_completed(futures):
-                batch = futures[future]
-
-                try:
-                    with monitor.time_compression():
-                        result = future.result()
-                except Exception as exc:  # pragma: no cover - defensive
-                    logging.error(
-                        "Batch compression exception (%s files, algo=%s): %s. Retrying individually.",
-                        len(batch),
-                        algo,
-                        exc,
-                    )
-                    for path, file_size in batch:
-                        stats.errors.append(f"Batch exception for {path}: {exc}")
-                        _compress_single(path, file_size, algo)
-                        _advance(1)
-                    continue
-
-                if result.returncode != 0:
-                    logging.debug(
-                        "Batch compact returned %s for %s with %s files. Falling back to single-file attempts.",
-                        result.returncode,
-                        algo,
-                        len(batch),
-                    )
-                    for path, file_size in batch:
-                        _compress_single(path, file_size, algo)
-                        _advance(1)
-                    continue
-
-                for path, file_size in batch:
-                    _finalize_success(path, file_size, algo, context='batch')
-                _advance(len(batch))
-
-    grouped: OrderedDict[str, list[tuple[Path, int]]] = OrderedDict()
-    for path, size, algorithm in plan:
-        grouped.setdefault(algorithm, []).append((path, size))
-
-    stage_items = list(grouped.items())
+                tally = future.result()
+                stats.merge(tally)
+                # Only this thread writes the counter and every file is counted once, so it needs no lock or clamp
+                stage_done[stage_idx] += len(futures[future])
+
+    # One sort yields both the stage grouping (in config order, tiny to large) and a largest-first order
+    # inside each stage; the pool's shared queue is pull-based, so idle workers take the long batches early
+    stage_rank = {algo: rank for rank, algo in enumerate(dict.fromkeys(COMPRESSION_ALGORITHMS.values()))}
+    ordered_plan = sorted(plan, key=lambda item: (stage_rank.get(item[2], len(stage_rank)), item[2], -item[1]))
+    stage_items = [
+        (algorithm, [(path, size) for path, size, _ in group])
+        for algorithm, group in groupby(ordered_plan, key=itemgetter(2))
+    ]
     stage_states: list[str] = ['pending'] * len(stage_items)
-    stage_progress = [{'processed': 0, 'total': len(entries)} for _, entries in stage_items]
+    stage_totals = [len(entries) for _, entries in stage_items]
+    stage_done = [0] * len(stage_items)
     render_lock = threading.Lock()
     rendered_lines = 0
     render_initialized = False
@@ -375,7 +534,7 @@ def _execute_plan(
 
     def _render_stage_statuses() -> None:
         nonlocal rendered_lines, render_initialized
-        if verbose or not stage_items:
+        if not interactive or not stage_items:
             return
 
         spinner_chars = ['\\', '|', '/', '-']
@@ -383,8 +542,8 @@ def _execute_plan(
 
         lines: list[str] = []
         for idx, (state, (algo, entries)) in enumerate(zip(stage_states, stage_items)):
-            total = stage_progress[idx]['total']
-            processed = min(stage_progress[idx]['processed'], total)
+            total = stage_totals[idx]
+            processed = stage_done[idx]
             if state == 'done':
                 lines.append(Fore.GREEN + f"Compressing {total} files with {algo}... done" + Style.RESET_ALL)
             elif state == 'running':
@@ -396,16 +555,16 @@ def _execute_plan(
             else:
                 lines.append(f"Pending {total} files for {algo} compression.")
 
+        frame: list[str] = []
         if not render_initialized:
-            sys.stdout.write("\n" * len(lines))
-            sys.stdout.flush()
+            frame.append("\n" * len(lines))
             render_initialized = True
             rendered_lines = len(lines)
 
-        if rendered_lines:
-            sys.stdout.write("\033[F" * rendered_lines)
-        for line in lines:
-            sys.stdout.write("\r" + line + "\033[K\n")
+        # Compose the whole frame first so each redraw is one write and one flush
+        frame.append("\033[F" * rendered_lines)
+        frame.extend(f"\r{line}\033[K\n" for line in lines)
+        sys.stdout.write("".join(frame))
         sys.stdout.flush()
         rendered_lines = len(lines)
 
@@ -420,24 +579,28 @@ def _execute_plan(
     render_thread: Optional[threading.Thread] = None
 
     try:
-        if not verbose and stage_items:
+        if interactive and stage_items:
             render_thread = threading.Thread(target=_render_loop, daemon=True)
             render_thread.start()
 
         for idx, (algorithm, entries) in enumerate(stage_items):
-            if not verbose:
+            if interactive:
                 with render_lock:
                     stage_states[idx] = 'running'
+            elif not verbose:
+                print(f"Compressing {stage_totals[idx]} files with {algorithm}...")
 
             if algorithm == 'LZX':
                 _process_group(algorithm, entries, _lzx_worker_count(), idx)
             else:
                 _process_group(algorithm, entries, _xp_worker_count(), idx)
 
-            if not verbose:
+            if interactive:
                 with render_lock:
                     stage_states[idx] = 'done'
-                    stage_progress[idx]['processed'] = stage_progress[idx]['total']
+                    stage_done[idx] = stage_totals[idx]
+            elif not verbose:
+                print(f"Compressing {stage_totals[idx]} files with {algorithm}... done")
     finally:
         if render_thread:
             stop_render.set()
@@ -472,33 +635,54 @@ def compress_directory_legacy(directory_path: str, thorough_check: bool = False)
         return stats
 
     print(f"Found {len(targets)} files that need branding...")
-    base_dir_str = str(base_dir)
-
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
-        future_to_file = {executor.submit(legacy_compress_file, path): path for path in targets}
-        total = len(targets)
-
-        for completed, future in enumerate(as_completed(future_to_file), start=1):
-            file_path = future_to_file[future]
-            relative_path = os.path.relpath(str(file_path), base_dir_str)
-
-            if completed % 10 == 0 or completed == total:
-                print(f"Progress: {completed}/{total} files processed ({completed / total * 100:.1f}%)")
+    base_prefix = os.path.join(str(base_dir), '')
+    total = len(targets)
+    completed = 0
+
+    def _brand_batch(batch: Sequence[tuple[str, int]]) -> tuple[LegacyCompressionStats, list[str]]:
+        # Runs on a worker thread so the post-branding checks spread across the pool with the compact calls
+        tally = LegacyCompressionStats()
+        messages: list[str] = []
+        try:
+            batch_succeeded = _legacy_compact_batch([path for path, _ in batch]).returncode == 0
+        except Exception as exc:  # pragma: no cover - defensive
+            logging.error("Batch branding exception (%s files): %s. Retrying individually.", len(batch), exc)
+            batch_succeeded = False
+        else:
+            if not batch_succeeded:
+                logging.debug("Batch compact failed for %s files. Falling back to single-file attempts.", len(batch))
 
+        for file_path, _ in batch:
             try:
-                result = future.result()
+                result = batch_succeeded or legacy_compress_file(file_path)
                 if result:
                     is_compressed, _ = is_file_compressed(file_path, thorough_check=False)
                     if is_compressed:
-                        stats.branded_files += 1
+                        tally.branded_files += 1
                     else:
-                        stats.still_unmarked += 1
-                        print(f"WARNING: File still not recognized as compressed: {relative_path}")
+                        tally.still_unmarked += 1
+                        messages.append(
+                            f"WARNING: File still not recognized as compressed: {_relative_to(file_path, base_prefix)}"
+                        )
                 else:
-                    print(f"ERROR: Failed branding file: {relative_path}")
+                    messages.append(f"ERROR: Failed branding file: {_relative_to(file_path, base_prefix)}")
             except Exception as exc:
-                stats.errors.append(f"Exception for {file_path}: {exc}")
-                print(f"ERROR: Exception {exc} while branding file: {relative_path}")
+                tally.errors.append(f"Exception for {file_path}: {exc}")
+                messages.append(f"ERROR: Exception {exc} while branding file: {_relative_to(file_path, base_prefix)}")
+        return tally, messages
+
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        future_to_batch = {executor.submit(_brand_batch, batch): batch for batch in _chunk(targets, _BATCH_SIZE)}
+
+        for future in as_completed(future_to_batch):
+            tally, messages = future.result()
+            stats.merge(tally)
+
+            # Emit the batch's messages together instead of printing per file
+            completed += len(future_to_batch[future])
+            messages.append(f"Progress: {completed}/{total} files processed ({completed / total * 100:.1f}%)")
+            sys.stdout.write("\n".join(messages) + "\n")
+            sys.stdout.flush()
 
     print(f"\nBranding complete. Successfully branded {stats.branded_files} files.")
     if stats.still_unmarked:
@@ -507,27 +691,33 @@ def compress_directory_legacy(directory_path: str, thorough_check: bool = False)
     return stats
 
 
+def _relative_to(path: str, base_prefix: str) -> str:
+    # Paths come from walking base_dir, so a prefix strip does what relpath would at a fraction of the cost
+    return path[len(base_prefix):] if path.startswith(base_prefix) else path
+
+
 def _collect_branding_targets(
     base_dir: Path,
     stats: LegacyCompressionStats,
     thorough_check: bool,
-) -> list[Path]:
-    targets: list[Path] = []
-    for root, _, files in os.walk(base_dir):
-        for name in files:
-            file_path = Path(root) / name
-            stats.total_files += 1
-
-            if file_path.suffix.lower() in SKIP_EXTENSIONS:
-                continue
+) -> list[tuple[str, int]]:
+    targets: list[tuple[str, int]] = []
+    for entry in _parallel_scandir_files(str(base_dir), _walk_worker_count(str(base_dir))):
+        stats.total_files += 1
 
-            try:
-                if file_path.stat().st_size < MIN_COMPRESSIBLE_SIZE:
-                    continue
+        if lower_suffix(entry.name) in SKIP_EXTENSIONS:
+            continue
 
-                is_compressed, _ = is_file_compressed(file_path, thorough_check)
-                if not is_compressed:
-                    targets.append(file_path)
-            except Exception as exc:
-                stats.errors.append(f"Error checking file {file_path}: {exc}")
-    return targets
\ No newline at end of file
+        try:
+            stat_result = entry.stat()
+            file_size = stat_result.st_size
+            if file_size < MIN_COMPRESSIBLE_SIZE:
+                continue
+
+            file_path = entry.path
+            is_compressed, _ = is_file_compressed(file_path, thorough_check, stat_result)
+            if not is_compressed:
+                targets.append((file_path, file_size))
+        except Exception as exc:
+            stats.errors.append(f"Error checking file {entry.path}: {exc}")
+    return targets
@@ -1,12 +1,13 @@
 import os
 from collections.abc import Iterable
-from typing import Final, Set, Tuple
+from functools import lru_cache
+from typing import Final, FrozenSet, Tuple
 
 import psutil
 
 
-def _flatten(groups: Iterable[Iterable[str]]) -> Set[str]:
-    return {ext for group in groups for ext in group}
+def _flatten(groups: Iterable[Iterable[str]]) -> FrozenSet[str]:
+    return frozenset().union(*groups)
 
 
 _ARCHIVES = ('.zip', '.rar', '.7z', '.gz', '.xz', '.bz2', '.tar')
@@ -17,7 +18,7 @@ _AUDIO = ('.mp3', '.aac', '.ogg', '.m4a', '.opus', '.flac', '.wav', '.wma', '.ac
 _ML = ('.gguf', '.h5', '.onnx', '.pb', '.tflite', '.safetensors', '.torch', '.pt')
 _OFFICE = ('.docx', '.xlsx', '.pptx', '.odt', '.ods', '.pdf')
 
-SKIP_EXTENSIONS: Final[Set[str]] = _flatten((
+SKIP_EXTENSIONS: Final[FrozenSet[str]] = _flatten((
     _ARCHIVES,
     _DISK_IMAGES,
     _IMAGES,
@@ -69,9 +70,12 @@ MIN_PHYSICAL_CORES_FOR_LZX: Final[int] = 3
 DEFAULT_EXCLUDE_DIRECTORIES: Final[Tuple[str, ...]] = _default_excluded_directories()
 
 
+@lru_cache(maxsize=1)
 def get_cpu_info() -> Tuple[int | None, int | None]:
+    # Core counts are fixed for the life of the process, so psutil only needs asking once
     physical = psutil.cpu_count(logical=False)
-    logical = psutil.cpu_count(logical=True)
+    # psutil can come back empty-handed on locked-down hosts; the stdlib count is still good for threads
+    logical = psutil.cpu_count(logical=True) or os.cpu_count()
     return physical, logical
 
 
@@ -30,6 +30,9 @@ def _read_msvcrt_input(prompt: str) -> str:
     escape_count = 0
 
     while True:
+        # Pasted paths arrive as a burst of queued keys, so flush once the burst drains, right before getwch() blocks
+        if not msvcrt.kbhit():
+            sys.stdout.flush()
         key = msvcrt.getwch()
 
         if key == '\x03':  # Ctrl+C
@@ -56,7 +59,6 @@ def _read_msvcrt_input(prompt: str) -> str:
             if buffer:
                 buffer.pop()
                 sys.stdout.write('\b \b')
-                sys.stdout.flush()
             continue
 
         if key in {'\x00', '\xe0'}:
@@ -66,7 +68,6 @@ def _read_msvcrt_input(prompt: str) -> str:
 
         buffer.append(key)
         sys.stdout.write(key)
-        sys.stdout.flush()
 
 
 def read_user_input(prompt: str) -> str:
@@ -2,17 +2,21 @@ import bisect
 import ctypes
 import logging
 import os
+import re
+import stat
 import subprocess
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from ctypes import wintypes
 from pathlib import Path
 from typing import Optional
 
-import wmi
-
 from .config import DEFAULT_EXCLUDE_DIRECTORIES, MIN_COMPRESSIBLE_SIZE, SIZE_THRESHOLDS, SKIP_EXTENSIONS
 
 
+# The walk asks should_skip_directory and contains_protected_path about the same directory back to back
+@lru_cache(maxsize=4096)
 def _normalize_for_compare(path: str | Path) -> str:
     normalized = os.path.normcase(os.path.normpath(str(path)))
     if len(normalized) == 2 and normalized[1] == ':':
@@ -26,17 +30,59 @@ _DEFAULT_EXCLUDE_MAP: dict[str, str] = {
 }
 
 
+def _with_trailing_sep(normalized: str) -> str:
+    return normalized if normalized.endswith(os.sep) else normalized + os.sep
+
+
+def _exclusion_index(excludes: dict[str, str]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    # Separator-terminated keys with nested entries dropped (their parent already covers them) guarantee that
+    # the closest key at or below a path in sort order is the only one that can be its ancestor
+    keys: list[str] = []
+    displays: list[str] = []
+    for key, display in sorted((_with_trailing_sep(norm), display) for norm, display in excludes.items()):
+        if keys and key.startswith(keys[-1]):
+            continue
+        keys.append(key)
+        displays.append(display)
+    return tuple(keys), tuple(displays)
+
+
+_EXCLUDE_KEYS, _EXCLUDE_DISPLAYS = _exclusion_index(_DEFAULT_EXCLUDE_MAP)
+
+
 def _match_exclusion(normalized: str) -> tuple[bool, Optional[str]]:
-    for excluded_norm, display in _DEFAULT_EXCLUDE_MAP.items():
-        if normalized == excluded_norm:
-            return True, f"Protected system directory ({display})"
-        prefix = excluded_norm + os.sep
-        if normalized.startswith(prefix):
-            return True, f"Within protected system directory ({display})"
-    return False, None
+    probe = _with_trailing_sep(normalized)
+    index = bisect.bisect_right(_EXCLUDE_KEYS, probe) - 1
+    if index < 0 or not probe.startswith(_EXCLUDE_KEYS[index]):
+        return False, None
+    display = _EXCLUDE_DISPLAYS[index]
+    if len(probe) == len(_EXCLUDE_KEYS[index]):
+        return True, f"Protected system directory ({display})"
+    return True, f"Within protected system directory ({display})"
 
 
 _SIZE_BREAKS, _SIZE_LABELS = zip(*SIZE_THRESHOLDS)
+
+
+def _bisect_size_category(file_size: int) -> str:
+    index = bisect.bisect_right(_SIZE_BREAKS, file_size)
+    return _SIZE_LABELS[index] if index < len(_SIZE_LABELS) else 'large'
+
+
+def _size_categories_by_bit_length() -> tuple[Optional[str], ...]:
+    # Every size with the same bit_length() shares a category as long as the thresholds are powers of two;
+    # any bucket that straddles a threshold is left as None and resolved with bisect instead
+    table: list[Optional[str]] = []
+    for bits in range(_SIZE_BREAKS[-1].bit_length() + 1):
+        low = 1 << (bits - 1) if bits else 0
+        high = (1 << bits) - 1
+        label = _bisect_size_category(low)
+        table.append(label if label == _bisect_size_category(high) else None)
+    return tuple(table)
+
+
+_SIZE_BY_BIT_LENGTH = _size_categories_by_bit_length()
+_MAX_SIZE_BITS = len(_SIZE_BY_BIT_LENGTH) - 1
 KERNEL32 = ctypes.WinDLL('kernel32', use_last_error=True)
 
 DRIVE_UNKNOWN = 0
@@ -48,15 +94,28 @@ DRIVE_CDROM = 5
 DRIVE_RAMDISK = 6
 
 IOCTL_STORAGE_QUERY_PROPERTY = 0x2D1400
+IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS = 0x560000
 PROPERTY_STANDARD_QUERY = 0
 STORAGE_DEVICE_SEEK_PENALTY_PROPERTY = 7
 
-GENERIC_READ = 0x80000000
 FILE_SHARE_READ = 0x00000001
 FILE_SHARE_WRITE = 0x00000002
 OPEN_EXISTING = 3
-FILE_ATTRIBUTE_NORMAL = 0x00000080
 INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+FILE_READ_ATTRIBUTES = 0x00000080
+FILE_SHARE_DELETE = 0x00000004
+FSCTL_GET_COMPRESSION = 0x0009003C
+FSCTL_GET_EXTERNAL_BACKING = 0x00090310
+ERROR_MORE_DATA = 234
+ERROR_OBJECT_NOT_EXTERNALLY_BACKED = 342
+MAX_PATH = 260
+IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003
+IO_REPARSE_TAG_SYMLINK = 0xA000000C
+
+# Without one of these bits NTFS stores the file at full size, so GetCompressedFileSizeW would only echo st_size
+_SIZE_ALTERING_ATTRIBUTES = (
+    stat.FILE_ATTRIBUTE_COMPRESSED | stat.FILE_ATTRIBUTE_SPARSE_FILE | stat.FILE_ATTRIBUTE_REPARSE_POINT
+)
 
 
 class STORAGE_PROPERTY_QUERY(ctypes.Structure):
@@ -75,6 +134,21 @@ class DEVICE_SEEK_PENALTY_DESCRIPTOR(ctypes.Structure):
     ]
 
 
+class DISK_EXTENT(ctypes.Structure):
+    _fields_ = [
+        ('DiskNumber', wintypes.DWORD),
+        ('StartingOffset', ctypes.c_longlong),
+        ('ExtentLength', ctypes.c_longlong),
+    ]
+
+
+class VOLUME_DISK_EXTENTS(ctypes.Structure):
+    _fields_ = [
+        ('NumberOfDiskExtents', wintypes.DWORD),
+        ('Extents', DISK_EXTENT * 1),
+    ]
+
+
 KERNEL32.GetDriveTypeW.argtypes = [wintypes.LPCWSTR]
 KERNEL32.GetDriveTypeW.restype = wintypes.UINT
 
@@ -116,8 +190,11 @@ KERNEL32.DeviceIoControl.restype = wintypes.BOOL
 KERNEL32.CloseHandle.argtypes = [wintypes.HANDLE]
 KERNEL32.CloseHandle.restype = wintypes.BOOL
 
+KERNEL32.GetCompressedFileSizeW.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(wintypes.DWORD)]
+KERNEL32.GetCompressedFileSizeW.restype = wintypes.DWORD
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VolumeDetails:
     anchor: Optional[str]
     drive_letter: Optional[str]
@@ -164,13 +241,14 @@ def _filesystem_name(anchor: str) -> Optional[str]:
 
 def _open_physical_drive(number: int) -> Optional[wintypes.HANDLE]:
     device_path = f"\\\\.\\PhysicalDrive{number}"
+    # The seek-penalty property query needs no access rights, so the probe also works from a non-elevated shell
     handle = KERNEL32.CreateFileW(
         device_path,
-        GENERIC_READ,
+        0,
         FILE_SHARE_READ | FILE_SHARE_WRITE,
         None,
         OPEN_EXISTING,
-        FILE_ATTRIBUTE_NORMAL,
+        0,
         None,
     )
     if handle == INVALID_HANDLE_VALUE:
@@ -181,38 +259,117 @@ def _open_physical_drive(number: int) -> Optional[wintypes.HANDLE]:
     return handle
 
 
-def get_volume_details(path: str) -> VolumeDetails:
+def _volume_disk_number(drive_letter: str) -> Optional[int]:
+    device_path = f"\\\\.\\{drive_letter}"
+    # Zero access rights are enough for the extents query and avoid needing admin rights on the volume
+    handle = KERNEL32.CreateFileW(
+        device_path,
+        0,
+        FILE_SHARE_READ | FILE_SHARE_WRITE,
+        None,
+        OPEN_EXISTING,
+        0,
+        None,
+    )
+    if handle == INVALID_HANDLE_VALUE:
+        error = ctypes.get_last_error()
+        if error:
+            logging.debug("CreateFileW failed for %s: %s", device_path, ctypes.WinError(error))
+        return None
+
+    try:
+        extents = VOLUME_DISK_EXTENTS()
+        returned = wintypes.DWORD()
+        # Volumes spanning several disks overflow the single-extent buffer and are left to WMI
+        success = KERNEL32.DeviceIoControl(
+            handle,
+            IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS,
+            None,
+            0,
+            ctypes.byref(extents),
+            ctypes.sizeof(extents),
+            ctypes.byref(returned),
+            None,
+        )
+        if not success or extents.NumberOfDiskExtents < 1:
+            error = ctypes.get_last_error()
+            if error:
+                logging.debug(
+                    "DeviceIoControl(volume disk extents) failed for %s: %s",
+                    drive_letter,
+                    ctypes.WinError(error),
+                )
+            return None
+        return extents.Extents[0].DiskNumber
+    finally:
+        KERNEL32.CloseHandle(handle)
+
+
+def get_volume_details(path: str, deep_probe: bool = False) -> VolumeDetails:
     anchor = _volume_anchor(path)
     letter = _drive_letter(path)
     if not anchor:
         logging.debug("Unable to resolve volume anchor for %s", path)
         return VolumeDetails(None, letter, DRIVE_UNKNOWN, None, None)
+    details = _probe_volume(anchor, letter)
+    if deep_probe and details.rotational is None and _is_inspectable(details):
+        return _deep_probe_volume(details)
+    return details
 
+
+def _is_inspectable(details: VolumeDetails) -> bool:
+    letter = details.drive_letter
+    return details.drive_type == DRIVE_FIXED and bool(letter) and len(letter) == 2 and letter[1] == ':'
+
+
+# Drive type, filesystem and rotational checks (WMI, DeviceIoControl) only change across remounts, so probe once per volume
+@lru_cache(maxsize=32)
+def _probe_volume(anchor: str, letter: Optional[str]) -> VolumeDetails:
     drive_type = KERNEL32.GetDriveTypeW(anchor)
     filesystem = None
     if drive_type not in {DRIVE_UNKNOWN, DRIVE_NO_ROOT_DIR}:
         filesystem = _filesystem_name(anchor)
 
-    rotational = None
-    if drive_type == DRIVE_FIXED and letter and len(letter) == 2 and letter[1] == ':':
-        inspector = _DriveInspector(letter)
-        rotational = inspector.seek_penalty()
-        if rotational is None:
-            rotational = inspector.by_metadata()
-            if rotational is None:
-                rotational = inspector.by_latency()
-                if rotational is None:
-                    inspector.note_alignment()
+    details = VolumeDetails(anchor, letter, drive_type, filesystem, None)
+    if not _is_inspectable(details):
+        return details
+    inspector = _drive_inspector(letter)
+    rotational = inspector.seek_penalty()
+    if rotational is None:
+        rotational = inspector.by_metadata()
+    return replace(details, rotational=rotational)
+
 
-    return VolumeDetails(anchor, letter, drive_type, filesystem, rotational)
+# Latency sampling holds the probe for 200 ms+, so only volumes the cheap checks left undecided pay for it, once
+@lru_cache(maxsize=32)
+def _deep_probe_volume(details: VolumeDetails) -> VolumeDetails:
+    inspector = _drive_inspector(details.drive_letter)
+    rotational = inspector.by_latency()
+    if rotational is None:
+        inspector.note_alignment()
+    return replace(details, rotational=rotational)
+
+
+def clear_volume_cache() -> None:
+    # Long-lived callers can drop cached probes after drives are added, swapped or remounted
+    _probe_volume.cache_clear()
+    _deep_probe_volume.cache_clear()
+    _drive_inspector.cache_clear()
+    _logical_disk_numbers.cache_clear()
 
 
 def get_size_category(file_size: int) -> str:
-    index = bisect.bisect_right(_SIZE_BREAKS, file_size)
-    return _SIZE_LABELS[index] if index < len(_SIZE_LABELS) else 'large'
+    label = _SIZE_BY_BIT_LENGTH[min(file_size.bit_length(), _MAX_SIZE_BITS)]
+    return label if label is not None else _bisect_size_category(file_size)
 
 
-def should_skip_directory(directory: Path) -> tuple[bool, str]:
+def lower_suffix(name: str) -> str:
+    # Same rules as PurePath.suffix, minus the Path construction: dotfiles and trailing dots have no suffix
+    dot = name.rfind('.')
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+
+
+def should_skip_directory(directory: str | Path) -> tuple[bool, str]:
     normalized = _normalize_for_compare(directory)
     match, reason = _match_exclusion(normalized)
     if match:
@@ -220,6 +377,22 @@ def should_skip_directory(directory: Path) -> tuple[bool, str]:
     return False, ""
 
 
+def is_redirected_directory(entry: os.DirEntry) -> bool:
+    # Junctions, volume mount points and directory symlinks lead into other trees, possibly on other volumes
+    try:
+        tag = getattr(entry.stat(follow_symlinks=False), 'st_reparse_tag', 0)
+    except OSError:
+        return False
+    return tag in (IO_REPARSE_TAG_MOUNT_POINT, IO_REPARSE_TAG_SYMLINK)
+
+
+def contains_protected_path(directory: str | Path) -> bool:
+    # True when some protected directory lies strictly below this one; keys sharing the prefix sort contiguously
+    probe = _with_trailing_sep(_normalize_for_compare(directory))
+    index = bisect.bisect_right(_EXCLUDE_KEYS, probe)
+    return index < len(_EXCLUDE_KEYS) and _EXCLUDE_KEYS[index].startswith(probe)
+
+
 def is_protected_path(path: str | Path) -> bool:
     normalized = _normalize_for_compare(path)
     match, _ = _match_exclusion(normalized)
@@ -238,38 +411,113 @@ def _hidden_startupinfo() -> subprocess.STARTUPINFO:
     return startupinfo
 
 
-def check_compression_with_compact(file_path: Path) -> bool:
+def _win32_path(path: str | Path) -> str:
+    # Win32 calls reject paths past MAX_PATH unless they carry the extended-length prefix; that prefix also turns
+    # off normalization, so only long paths get it and they are made absolute first
+    text = os.fspath(path)
+    if len(text) < MAX_PATH or text.startswith('\\\\?\\'):
+        return text
+    text = os.path.abspath(text)
+    if text.startswith('\\\\'):
+        return '\\\\?\\UNC\\' + text[2:]
+    return '\\\\?\\' + text
+
+
+def check_compression_with_compact(file_path: str | Path) -> bool:
     try:
-        command = f'compact /a "{file_path}"'
         result = subprocess.run(
-            command,
+            ['compact', '/a', _win32_path(file_path)],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             startupinfo=_hidden_startupinfo(),
-            shell=True,
-            text=True,
         )
         if result.returncode != 0:
             return False
-        return "0 are not" in result.stdout
+        # The marker is plain ASCII, so match the raw bytes rather than decoding the listing first
+        return b"0 are not" in result.stdout
     except Exception as exc:
         logging.error("Failed to check compression with compact: %s", exc)
         return False
 
 
-def is_file_compressed(file_path: Path, thorough_check: bool = False) -> tuple[bool, int]:
+def _native_compression_marker(file_path: str | Path) -> Optional[bool]:
+    # Answers in-process what `compact /a` reports; None means the handle or FSCTL was refused
+    handle = KERNEL32.CreateFileW(
+        _win32_path(file_path),
+        FILE_READ_ATTRIBUTES,
+        FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE,
+        None,
+        OPEN_EXISTING,
+        0,
+        None,
+    )
+    if handle == INVALID_HANDLE_VALUE:
+        return None
+
+    try:
+        returned = wintypes.DWORD()
+        compression_format = wintypes.USHORT()
+        if not KERNEL32.DeviceIoControl(
+            handle,
+            FSCTL_GET_COMPRESSION,
+            None,
+            0,
+            ctypes.byref(compression_format),
+            ctypes.sizeof(compression_format),
+            ctypes.byref(returned),
+            None,
+        ):
+            return None
+        if compression_format.value:
+            return True
+
+        # WOF compression (XPRESS/LZX) leaves the NTFS format at NONE and shows up as external backing instead
+        backing = (ctypes.c_byte * 64)()
+        if KERNEL32.DeviceIoControl(
+            handle,
+            FSCTL_GET_EXTERNAL_BACKING,
+            None,
+            0,
+            backing,
+            ctypes.sizeof(backing),
+            ctypes.byref(returned),
+            None,
+        ):
+            return True
+        error = ctypes.get_last_error()
+        if error == ERROR_MORE_DATA:
+            return True
+        if error == ERROR_OBJECT_NOT_EXTERNALLY_BACKED:
+            return False
+        return None
+    finally:
+        KERNEL32.CloseHandle(handle)
+
+
+def _has_compression_marker(file_path: str | Path) -> bool:
+    marked = _native_compression_marker(file_path)
+    if marked is not None:
+        return marked
+    return check_compression_with_compact(file_path)
+
+
+def is_file_compressed(
+    file_path: str | Path,
+    thorough_check: bool = False,
+    stat_result: Optional[os.stat_result] = None,
+) -> tuple[bool, int]:
+    attributes = getattr(stat_result, 'st_file_attributes', None)
     try:
-        actual_size = file_path.stat().st_size
+        actual_size = (stat_result or os.stat(file_path)).st_size
     except Exception as exc:
         logging.error("Failed to get actual file size: %s", exc)
         return False, 0
 
-    getter = KERNEL32.GetCompressedFileSizeW
-    getter.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(wintypes.DWORD)]
-    getter.restype = wintypes.DWORD
+    if not thorough_check and attributes is not None and not attributes & _SIZE_ALTERING_ATTRIBUTES:
+        return False, actual_size
 
     high = wintypes.DWORD()
-    low = getter(str(file_path), ctypes.byref(high))
+    low = KERNEL32.GetCompressedFileSizeW(_win32_path(file_path), ctypes.byref(high))
 
     if low == 0xFFFFFFFF:
         error = ctypes.get_last_error()
@@ -282,24 +530,31 @@ def is_file_compressed(file_path: Path, thorough_check: bool = False) -> tuple[b
         return True, compressed_size
 
     if thorough_check and compressed_size == actual_size:
-        if check_compression_with_compact(file_path):
-            logging.debug("File %s detected as compressed by compact command", file_path)
+        if _has_compression_marker(file_path):
+            logging.debug("File %s detected as compressed by its compression marker", file_path)
             return True, compressed_size
 
     return False, compressed_size
 
 
-def should_compress_file(file_path: Path, thorough_check: bool = False) -> tuple[bool, str, int]:
-    suffix = file_path.suffix.lower()
+def should_compress_file(
+    file_path: str | Path,
+    thorough_check: bool = False,
+    stat_result: Optional[os.stat_result] = None,
+) -> tuple[bool, str, int]:
+    suffix = lower_suffix(os.path.basename(file_path))
     if suffix in SKIP_EXTENSIONS:
         return False, f"Skipped due to extension {suffix}", 0
 
     try:
-        file_size = file_path.stat().st_size
+        # Callers that already hold a stat result pass it in so the file is only stat'ed once
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        file_size = stat_result.st_size
         if file_size < MIN_COMPRESSIBLE_SIZE:
             return False, f"File too small ({file_size} bytes)", file_size
 
-        is_compressed, compressed_size = is_file_compressed(file_path, thorough_check)
+        is_compressed, compressed_size = is_file_compressed(file_path, thorough_check, stat_result)
         if is_compressed:
             return False, "File is already compressed", compressed_size
 
@@ -309,9 +564,9 @@ def should_compress_file(file_path: Path, thorough_check: bool = False) -> tuple
         return False, f"Error during check: {exc}", 0
 
 
-def is_hard_drive(drive_path: str) -> bool:
+def is_hard_drive(drive_path: str, deep_probe: bool = False) -> bool:
     try:
-        details = get_volume_details(drive_path)
+        details = get_volume_details(drive_path, deep_probe)
     except Exception as exc:
         logging.error("Error detecting drive type: %s", exc)
         return False
@@ -346,11 +601,98 @@ def _drive_letter(drive_path: str) -> Optional[str]:
     return drive_letter or None
 
 
+# Naming the columns keeps WMI from marshalling every Win32_DiskDrive property
+_DISK_DRIVE_FIELDS = 'DeviceID, InterfaceType, Description, MediaType, Model, Size, DefaultBlockSize'
+_DESCRIPTION_SSD = re.compile(r'ssd|solid state|flash', re.IGNORECASE)
+_DESCRIPTION_HDD = re.compile(r'hard drive|hard disk', re.IGNORECASE)
+_MEDIA_SSD = re.compile(r'ssd|solid|flash', re.IGNORECASE)
+_MEDIA_HDD = re.compile(r'hard|hdd|rotating', re.IGNORECASE)
+_MODEL_SSD = re.compile(r'ssd|nvme|solid state|m\.2', re.IGNORECASE)
+_LOGICAL_DISK_RE = re.compile(r'DeviceID="([A-Za-z]:)"')
+_PARTITION_DISK_RE = re.compile(r'Disk #(\d+)')
+
+
+# A WMI connection is a full COM/DCOM setup, so every inspector shares one and only HDD checks pay for the import;
+# raw SWbem queries skip the wmi package's per-attribute reflection wrappers
+@lru_cache(maxsize=1)
+def _wmi_connection():
+    try:
+        import win32com.client
+    except ImportError:
+        # Without pywin32 the WMI fallbacks go quiet and detection rests on the DeviceIoControl probes
+        logging.debug("pywin32 is not installed; skipping WMI drive checks")
+        return None
+
+    return win32com.client.GetObject(r"winmgmts:\\.\root\cimv2")
+
+
+def _wmi_query(wql: str) -> list:
+    connection = _wmi_connection()
+    if connection is None:
+        return []
+    return list(connection.ExecQuery(wql))
+
+
+@lru_cache(maxsize=1)
+def _logical_disk_numbers() -> dict[str, int]:
+    numbers: dict[str, int] = {}
+    # Raw queries return the association ends as object paths, e.g. ...Win32_DiskPartition.DeviceID="Disk #0, Partition #1"
+    for relation in _wmi_query("SELECT Antecedent, Dependent FROM Win32_LogicalDiskToPartition"):
+        try:
+            letter = _LOGICAL_DISK_RE.search(relation.Dependent)
+            disk = _PARTITION_DISK_RE.search(relation.Antecedent)
+        except (AttributeError, TypeError):
+            letter = disk = None
+        if letter is None or disk is None:
+            logging.debug(
+                "Failed to extract physical disk number from antecedent: %s",
+                getattr(relation, 'Antecedent', 'N/A'),
+            )
+            continue
+        numbers.setdefault(letter.group(1).upper(), int(disk.group(1)))
+    return numbers
+
+
+def _perflib_disk_latency(disk_number: int) -> Optional[tuple[float, float]]:
+    # Perflib reads the counters directly, while the formatted WMI perf class refreshes every disk per query
+    try:
+        import win32pdh
+    except ImportError:
+        return None
+
+    try:
+        _, instances = win32pdh.EnumObjectItems(None, None, 'PhysicalDisk', win32pdh.PERF_DETAIL_WIZARD)
+        instance = next((name for name in instances if name.split()[:1] == [str(disk_number)]), None)
+        if instance is None:
+            return None
+
+        query = win32pdh.OpenQuery()
+        try:
+            counters = [
+                win32pdh.AddEnglishCounter(query, f"\\PhysicalDisk({instance})\\{counter}")
+                for counter in ('Avg. Disk sec/Read', 'Avg. Disk sec/Write')
+            ]
+            # Averaged counters only report a value once two samples exist
+            win32pdh.CollectQueryData(query)
+            time.sleep(0.2)
+            win32pdh.CollectQueryData(query)
+            read_latency, write_latency = (
+                win32pdh.GetFormattedCounterValue(counter, win32pdh.PDH_FMT_DOUBLE)[1] for counter in counters
+            )
+        finally:
+            win32pdh.CloseQuery(query)
+    except Exception as exc:
+        # Localized counter sets or a disabled Perflib provider leave the WMI class as the fallback
+        logging.debug("Perflib latency query failed for disk %s: %s", disk_number, exc)
+        return None
+    return read_latency, write_latency
+
+
 class _DriveInspector:
     def __init__(self, drive_letter: str):
         self.drive_letter = drive_letter
-        self.conn = wmi.WMI()
         self._disk_number: Optional[int] = None
+        self._disk_rows: Optional[list] = None
 
     def seek_penalty(self) -> Optional[bool]:
         disk_number = self._physical_disk_number()
@@ -397,9 +739,7 @@ class _DriveInspector:
         if disk_number is None:
             return None
 
-        device_id = f"\\\\.\\PHYSICALDRIVE{disk_number}"
-        disks = self.conn.Win32_DiskDrive(DeviceID=device_id)
-        for disk in disks:
+        for disk in self._disk_drives(disk_number):
             logging.debug(
                 "Inspecting disk: %s",
                 {
@@ -415,28 +755,34 @@ class _DriveInspector:
                 return verdict
         return None
 
+    def _disk_drives(self, disk_number: int) -> list:
+        # by_metadata and note_alignment read the same Win32_DiskDrive row, so fetch every column they need once
+        if self._disk_rows is None:
+            self._disk_rows = _wmi_query(f"SELECT {_DISK_DRIVE_FIELDS} FROM Win32_DiskDrive WHERE Index = {disk_number}")
+        return self._disk_rows
+
     def _metadata_verdict(self, disk) -> Optional[bool]:
         interface = getattr(disk, 'InterfaceType', '') or ''
         if 'nvme' in interface.lower():
             logging.debug("Drive %s is NVMe, treating as SSD", self.drive_letter)
             return False
 
-        description = (getattr(disk, 'Description', '') or '').lower()
-        if any(term in description for term in ['ssd', 'solid state', 'flash']):
+        description = getattr(disk, 'Description', '') or ''
+        if _DESCRIPTION_SSD.search(description):
             logging.debug("Drive %s describes itself as SSD/flash", self.drive_letter)
             return False
-        if any(term in description for term in ['hard drive', 'hard disk']):
+        if _DESCRIPTION_HDD.search(description):
             logging.debug("Drive %s describes itself as HDD", self.drive_letter)
             return True
 
-        media_type = (getattr(disk, 'MediaType', '') or '').lower()
-        if any(term in media_type for term in ['ssd', 'solid', 'flash']):
+        media_type = getattr(disk, 'MediaType', '') or ''
+        if _MEDIA_SSD.search(media_type):
             return False
-        if any(term in media_type for term in ['hard', 'hdd', 'rotating']):
+        if _MEDIA_HDD.search(media_type):
             return True
 
-        model = (getattr(disk, 'Model', '') or '').lower()
-        if any(term in model for term in ['ssd', 'nvme', 'solid state', 'm.2']):
+        model = getattr(disk, 'Model', '') or ''
+        if _MODEL_SSD.search(model):
             return False
         return None
 
@@ -445,26 +791,40 @@ class _DriveInspector:
         if disk_number is None:
             return None
 
-        for physical_disk in self.conn.Win32_PerfFormattedData_PerfDisk_PhysicalDisk():
-            if physical_disk.Name == "_Total":
-                continue
+        latencies = _perflib_disk_latency(disk_number)
+        if latencies is None:
+            latencies = self._wmi_disk_latency(disk_number)
+        if latencies is None:
+            return None
+
+        read_latency, write_latency = latencies
+        logging.debug(
+            "Performance data for disk %s: read=%s, write=%s",
+            disk_number,
+            read_latency,
+            write_latency,
+        )
+        if read_latency and read_latency > 0.003:
+            logging.debug("Drive %s has HDD-like read latency: %ss", self.drive_letter, read_latency)
+            return True
+        if write_latency and write_latency > 0.003:
+            logging.debug("Drive %s has HDD-like write latency: %ss", self.drive_letter, write_latency)
+            return True
+        return None
+
+    def _wmi_disk_latency(self, disk_number: int) -> Optional[tuple[Optional[float], Optional[float]]]:
+        # Instances are named "<disk> <letters>", so the LIKE filter leaves WMI to refresh just this disk's row
+        for physical_disk in _wmi_query(
+            "SELECT Name, AvgDiskSecPerRead, AvgDiskSecPerWrite FROM Win32_PerfFormattedData_PerfDisk_PhysicalDisk"
+            f" WHERE Name LIKE '{disk_number} %'"
+        ):
             try:
                 disk_info = physical_disk.Name.split()
                 if disk_info and int(disk_info[0]) == disk_number:
-                    read_latency = getattr(physical_disk, 'AvgDiskSecPerRead', None)
-                    write_latency = getattr(physical_disk, 'AvgDiskSecPerWrite', None)
-                    logging.debug(
-                        "Performance data for disk %s: read=%s, write=%s",
-                        disk_number,
-                        read_latency,
-                        write_latency,
+                    return (
+                        getattr(physical_disk, 'AvgDiskSecPerRead', None),
+                        getattr(physical_disk, 'AvgDiskSecPerWrite', None),
                     )
-                    if read_latency and read_latency > 0.003:
-                        logging.debug("Drive %s has HDD-like read latency: %ss", self.drive_letter, read_latency)
-                        return True
-                    if write_latency and write_latency > 0.003:
-                        logging.debug("Drive %s has HDD-like write latency: %ss", self.drive_letter, write_latency)
-                        return True
             except (ValueError, IndexError):
                 logging.debug("Error processing physical disk performance data")
                 continue
@@ -474,30 +834,20 @@ class _DriveInspector:
         if self._disk_number is not None:
             return self._disk_number
 
-        for relation in self.conn.Win32_LogicalDiskToPartition():
-            try:
-                if relation.Dependent.DeviceID == self.drive_letter:
-                    antecedent = relation.Antecedent
-                    disk_id = antecedent.split('PHYSICALDRIVE')[1]
-                    number = int(''.join(filter(str.isdigit, disk_id)))
-                    logging.debug("Found physical disk number %s for drive %s", number, self.drive_letter)
-                    self._disk_number = number
-                    return number
-            except (AttributeError, IndexError, ValueError):
-                logging.debug(
-                    "Failed to extract physical disk number from antecedent: %s",
-                    getattr(relation, 'Antecedent', 'N/A'),
-                )
-        return None
+        number = _volume_disk_number(self.drive_letter)
+        if number is None:
+            number = _logical_disk_numbers().get(self.drive_letter.upper())
+        if number is not None:
+            logging.debug("Found physical disk number %s for drive %s", number, self.drive_letter)
+            self._disk_number = number
+        return number
 
     def note_alignment(self) -> None:
         disk_number = self._physical_disk_number()
         if disk_number is None:
             return
 
-        device_id = f"\\\\.\\PHYSICALDRIVE{disk_number}"
-        disks = self.conn.Win32_DiskDrive(DeviceID=device_id)
-        for disk in disks:
+        for disk in self._disk_drives(disk_number):
             # Alignment is a weak signal, yet logging it helps post-mortem drive reports
             size = getattr(disk, 'Size', None)
             block = getattr(disk, 'DefaultBlockSize', None)
@@ -507,3 +857,9 @@ class _DriveInspector:
                     logging.debug("Drive %s has aligned sectors, common in HDDs", self.drive_letter)
             except (TypeError, ZeroDivisionError):
                 logging.debug("Error calculating sector alignment for drive %s", self.drive_letter)
+
+
+# One inspector per drive letter, so the cheap and deep probes share its disk number and Win32_DiskDrive rows
+@lru_cache(maxsize=32)
+def _drive_inspector(drive_letter: str) -> _DriveInspector:
+    return _DriveInspector(drive_letter)
@@ -1,5 +1,4 @@
 import os
-import shlex
 from argparse import Namespace
 from dataclasses import dataclass
 
@@ -17,6 +16,16 @@ FLAG_METADATA: dict[str, tuple[str, str]] = {
     'single_worker': ('-s', 'Throttle for HDDs'),
 }
 
+EXCLUSIVE_FLAGS: dict[str, str] = {
+    'thorough': 'brand_files',
+    'brand_files': 'thorough',
+    'no_lzx': 'force_lzx',
+    'force_lzx': 'no_lzx',
+}
+
+SHORT_FLAGS: dict[str, str] = {flag[1:]: key for key, (flag, _) in FLAG_METADATA.items()}
+LONG_FLAGS: dict[str, str] = {key.replace('_', '-'): key for key in FLAG_METADATA}
+
 
 @dataclass
 class LaunchState:
@@ -31,14 +40,9 @@ class LaunchState:
     def toggle(self, key: str) -> None:
         # Mutually exclusive switches get untangled here so the prompt never lies
         enabled = not getattr(self, key)
-        if key == 'thorough' and enabled:
-            self.brand_files = False
-        if key == 'brand_files' and enabled:
-            self.thorough = False
-        if key == 'no_lzx' and enabled:
-            self.force_lzx = False
-        if key == 'force_lzx' and enabled:
-            self.no_lzx = False
+        partner = EXCLUSIVE_FLAGS.get(key)
+        if enabled and partner:
+            setattr(self, partner, False)
         setattr(self, key, enabled)
 
 
@@ -56,46 +60,54 @@ def _print_flag_reference() -> None:
         print(f"  {flag:<6} {description}")
 
 
-def _apply_flag_string(raw: str, state: LaunchState) -> None:
-    tokens = shlex.split(raw, posix=False)
-    if not tokens:
-        return
-
-    short_map = {'v': 'verbose', 'x': 'no_lzx', 'f': 'force_lzx', 't': 'thorough', 'b': 'brand_files'}
-    long_map = {
-        'verbose': 'verbose',
-        'no-lzx': 'no_lzx',
-        'force-lzx': 'force_lzx',
-        'thorough': 'thorough',
-        'brand-files': 'brand_files',
-        'single-worker': 'single_worker',
-    }
-    short_map['s'] = 'single_worker'
-
-    for token in tokens:
-        if token.startswith('--'):
-            flag_key = long_map.get(token[2:])
-            if flag_key:
-                state.toggle(flag_key)
+def _scan_tokens(text: str) -> list[str]:
+    # Mirrors shlex's non-POSIX mode: a quote only opens a quoted token at the start of a word, the token keeps its
+    # quotes and ends where they close, and apostrophes inside a word (O'Brien) are plain characters. An unclosed
+    # quote simply runs to the end instead of raising
+    if '"' not in text and "'" not in text:
+        return text.split()
+
+    tokens: list[str] = []
+    start = -1
+    quote = ''
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                tokens.append(text[start:index + 1])
+                start = -1
+                quote = ''
             continue
+        if char.isspace():
+            if start >= 0:
+                tokens.append(text[start:index])
+                start = -1
+            continue
+        if start < 0:
+            start = index
+            if char in '"\'':
+                quote = char
+    if start >= 0:
+        tokens.append(text[start:])
+    return tokens
 
-        if token.startswith('-') and len(token) > 1:
-            for char in token[1:]:
-                mapped = short_map.get(char)
-                if mapped:
-                    state.toggle(mapped)
 
+def _apply_flag_string(raw: str, state: LaunchState) -> None:
+    for token in _scan_tokens(raw):
+        _apply_flag_token(token, state)
 
-def _split_path_and_flags(tokens: list[str]) -> tuple[list[str], list[str]]:
-    # Treat leading flags and trailing toggles uniformly; Windows paths don't start with '-'
-    path_tokens: list[str] = []
-    flag_tokens: list[str] = []
-    for token in tokens:
-        if token.startswith('-'):
-            flag_tokens.append(token)
-            continue
-        path_tokens.append(token)
-    return path_tokens, flag_tokens
+
+def _apply_flag_token(token: str, state: LaunchState) -> None:
+    if token.startswith('--'):
+        flag_key = LONG_FLAGS.get(token[2:])
+        if flag_key:
+            state.toggle(flag_key)
+        return
+
+    if token.startswith('-') and len(token) > 1:
+        for char in token[1:]:
+            mapped = SHORT_FLAGS.get(char)
+            if mapped:
+                state.toggle(mapped)
 
 
 def _print_interactive_status(state: LaunchState) -> None:
@@ -112,9 +124,13 @@ def _apply_composite_command(parts: list[str], state: LaunchState) -> bool:
     # Returns True if a path was supplied, so the caller can short-circuit the default handler
     if not parts:
         return False
-    path_tokens, flag_tokens = _split_path_and_flags(parts)
-    if flag_tokens:
-        _apply_flag_string(" ".join(flag_tokens), state)
+    # Treat leading flags and trailing toggles uniformly; Windows paths don't start with '-'
+    path_tokens: list[str] = []
+    for token in parts:
+        if token.startswith('-'):
+            _apply_flag_token(token, state)
+        else:
+            path_tokens.append(token)
     if path_tokens:
         state.directory = sanitize_path(" ".join(path_tokens))
         return True
@@ -174,12 +190,7 @@ def interactive_configure(args: Namespace) -> Namespace:
             _apply_flag_string(command, state)
             continue
 
-        try:
-            parts = shlex.split(command, posix=False)
-        except ValueError:
-            parts = []
-
-        if _apply_composite_command(parts, state):
+        if _apply_composite_command(_scan_tokens(command), state):
             continue
 
         state.directory = sanitize_path(command)
@@ -1,5 +1,6 @@
 import logging
 import os
+from functools import lru_cache
 from typing import Optional
 
 from colorama import Fore, Style
@@ -17,7 +18,13 @@ from .compression import set_worker_cap
 
 
 def sanitize_path(path: str) -> str:
-    return os.path.normpath(path.strip(" '\""))
+    return _normalize_path(path.strip(" '\""))
+
+
+# The interactive loop re-sanitizes the same directory on most passes, so keep recent results
+@lru_cache(maxsize=64)
+def _normalize_path(path: str) -> str:
+    return os.path.normpath(path)
 
 
 def is_admin() -> bool:
@@ -85,7 +92,9 @@ def resolve_directory(argument: Optional[str]) -> str:
 
 
 def confirm_hdd_usage(directory: str, force_serial: bool) -> bool:
-    details = get_volume_details(directory)
+    # Deep probing only kicks in when seek penalty and WMI metadata are inconclusive, so the prompt still fires for
+    # drives that only latency sampling can classify
+    details = get_volume_details(directory, deep_probe=True)
     throttle_requested = force_serial  # Carry over manual single-worker overrides
     target_label = details.drive_letter or directory
 
@@ -38,7 +38,11 @@ class Spinner:
     def _spin(self) -> None:
         while self._running:
             with self._lock:
-                progress = f"({self.processed}/{self.total})" if self.total else ""
+                if self.total:
+                    progress = f"({self.processed}/{self.total})"
+                else:
+                    # Streaming callers don't know the total up front, so show a running count instead
+                    progress = f"({self.processed})" if self.processed else ""
                 output = f"\r {self._chars[self._index]} {self._label}"
                 if self._message:
                     output += f" {self._message}"
@@ -87,6 +91,15 @@ class CompressionStats:
     total_skipped_size: int = 0
     errors: List[str] = field(default_factory=list)
 
+    def merge(self, other: "CompressionStats") -> None:
+        self.compressed_files += other.compressed_files
+        self.skipped_files += other.skipped_files
+        self.already_compressed_files += other.already_compressed_files
+        self.total_original_size += other.total_original_size
+        self.total_compressed_size += other.total_compressed_size
+        self.total_skipped_size += other.total_skipped_size
+        self.errors.extend(other.errors)
+
 
 @dataclass
 class LegacyCompressionStats:
@@ -95,6 +108,12 @@ class LegacyCompressionStats:
     still_unmarked: int = 0
     errors: List[str] = field(default_factory=list)
 
+    def merge(self, other: "LegacyCompressionStats") -> None:
+        self.total_files += other.total_files
+        self.branded_files += other.branded_files
+        self.still_unmarked += other.still_unmarked
+        self.errors.extend(other.errors)
+
 
 def print_compression_summary(stats: CompressionStats) -> None:
     logging.info("\nCompression Summary")
@@ -0,0 +1,28 @@
+import sys
+import unittest
+
+if sys.platform != 'win32':
+    raise unittest.SkipTest("trash-compactor only runs on Windows")
+
+from src.launch import LaunchState, _apply_composite_command, _scan_tokens
+
+
+class ScanTokensTest(unittest.TestCase):
+    def test_apostrophe_inside_path_is_literal(self):
+        self.assertEqual(_scan_tokens(r"C:\Users\O'Brien\Docs -v"), [r"C:\Users\O'Brien\Docs", '-v'])
+
+    def test_quoted_token_keeps_quotes_and_ends_at_close(self):
+        self.assertEqual(_scan_tokens('"C:\\My Files" -v'), ['"C:\\My Files"', '-v'])
+        self.assertEqual(_scan_tokens('"abc"def'), ['"abc"', 'def'])
+
+    def test_unclosed_quote_runs_to_end(self):
+        self.assertEqual(_scan_tokens('"C:\\My Files -v'), ['"C:\\My Files -v'])
+
+    def test_apostrophe_path_followed_by_flag_applies_flag(self):
+        state = LaunchState()
+        self.assertTrue(_apply_composite_command(_scan_tokens(r"C:\Users\O'Brien\Docs -v"), state))
+        self.assertTrue(state.verbose)
+
+
+if __name__ == '__main__':
+    unittest.main()